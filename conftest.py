@@ -0,0 +1,94 @@
+"""pytest configuration for the SeqGPT Local MCP Server tests"""
+
+from dataclasses import dataclass
+from functools import cached_property
+
+import httpx
+import pytest
+
+REMOTE_SERVER_BASE_URL = "https://seqgpt-server-for-mcp-761250691807.us-central1.run.app"
+LOCAL_SERVER_BASE_URL = "http://localhost:8000"
+
+
+@dataclass(frozen=True)
+class Endpoints:
+    """Endpoint URLs of a server, each built once per base URL"""
+    base: str
+
+    @cached_property
+    def upload(self):
+        return f"{self.base}/upload"
+
+    @cached_property
+    def create_random_csv(self):
+        return f"{self.base}/create-random-csv"
+
+    @cached_property
+    def csv_sql(self):
+        return f"{self.base}/csv-sql"
+
+    @cached_property
+    def preview_csv(self):
+        return f"{self.base}/preview-csv"
+
+    @cached_property
+    def csv_to_vcf(self):
+        return f"{self.base}/csv-to-vcf"
+
+    @cached_property
+    def gwas_plink(self):
+        return f"{self.base}/gwas-plink"
+
+
+def pytest_addoption(parser):
+    parser.addoption("--local", action="store_true", default=False,
+                     help="Test against local server URLs (localhost:8000) instead of remote server")
+    parser.addoption("--run-live", action="store_true", default=False,
+                     help="Also run the live tests against the real server")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "live: test talks to the real server (enable with --run-live)")
+
+
+def _selected_server_base_url(config):
+    if config.getoption("--local"):
+        return LOCAL_SERVER_BASE_URL
+    return REMOTE_SERVER_BASE_URL
+
+
+def _server_is_up(server_base_url):
+    """Probe the server once; any HTTP response, even an error status, means it is reachable"""
+    try:
+        httpx.head(server_base_url, timeout=2)
+    except httpx.TransportError:
+        return False
+    return True
+
+
+def pytest_collection_modifyitems(config, items):
+    live_items = [item for item in items if "live" in item.keywords]
+    if not live_items:
+        return
+    if not config.getoption("--run-live"):
+        skip_live = pytest.mark.skip(reason="live server test (use --run-live to enable)")
+    else:
+        server_base_url = _selected_server_base_url(config)
+        if _server_is_up(server_base_url):
+            return
+        # Skip the whole live group at once instead of waiting out a timeout per test
+        skip_live = pytest.mark.skip(reason=f"server not reachable at {server_base_url}")
+    for item in live_items:
+        item.add_marker(skip_live)
+
+
+@pytest.fixture(scope="session")
+def server_base_url(request):
+    """Base URL of the server under test, selected by the --local option"""
+    return _selected_server_base_url(request.config)
+
+
+@pytest.fixture(scope="session")
+def endpoints(server_base_url):
+    """Endpoint URLs of the server under test"""
+    return Endpoints(server_base_url)
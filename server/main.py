@@ -1,5 +1,5 @@
 """SeqGPT Local MCP Server
-Tools: upload_file, create_random_csv, csv_sql_query, preview_csv, csv_to_vcf, gwas_plink
+Tools: upload_file, upload_many, create_random_csv, csv_sql_query, preview_csv, preview_many, csv_to_vcf, gwas_plink
 Resource: hello://helper
 
 Usage:
@@ -10,46 +10,266 @@ MCP_TRANSPORT=streamable-http python server.py --local  # http mode with local s
 
 from __future__ import annotations
 import os
-import random
-import tempfile
-import json
-import urllib.request
-import urllib.parse
-import urllib.error
+import secrets
 import argparse
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable
+from contextlib import asynccontextmanager
 
 # ---- vendor hook (safe) ----
-import sys, pathlib, os
+import sys, pathlib
 HERE = pathlib.Path(__file__).resolve().parent
 LIB = HERE / "lib"
 if LIB.exists():
     sys.path.insert(0, str(LIB))
 # Optional: guard against old Pythons early (before importing anything heavy)
-import sys
 if sys.version_info < (3, 10):
     print("SeqGPT MCP requires Python 3.10+ (detected %s). Please install Python 3.11/3.12." % sys.version, file=sys.stderr)
     raise SystemExit(1)
-# Optional: scrub noisy env vars (belt & suspenders)
-for k in ("PYTHONHOME","PYTHONPATH","CONDA_PREFIX","CONDA_PYTHON_EXE","CONDA_DEFAULT_ENV","CONDA_SHLVL"):
-    os.environ.pop(k, None)
+# Optional: scrub noisy env vars (belt & suspenders), once per process tree
+def _scrub_env() -> None:
+    if os.environ.get("_SEQGPT_SCRUBBED") == "1":
+        return
+    for k in ("PYTHONHOME","PYTHONPATH","CONDA_PREFIX","CONDA_PYTHON_EXE","CONDA_DEFAULT_ENV","CONDA_SHLVL"):
+        os.environ.pop(k, None)
+    os.environ["_SEQGPT_SCRUBBED"] = "1"
+_scrub_env()
 from mcp.server.fastmcp import FastMCP
 # ---- rest of your server ----
 
 
-from mcp.server.fastmcp import FastMCP
+import anyio
+import httpx
 
-mcp = FastMCP("seqgpt-local-mcp")
+# orjson is pinned in requirements.txt; fall back to the stdlib json module when a
+# bundle was built without it (e.g. from the mcp package alone)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
 
 # Global server URL - defaults to remote, can be overridden with --local flag
 SERVER_BASE_URL = "https://seqgpt-server-for-mcp-761250691807.us-central1.run.app"
 
+# Size of each file read while streaming an upload body
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Uploads at or above this size are sent with chunked transfer encoding
+CHUNKED_UPLOAD_THRESHOLD = 16 * 1024 * 1024
+
+# Static tail of the multipart file part headers, shared by every upload
+MULTIPART_STATIC_HEADERS = b'\r\nContent-Type: application/octet-stream\r\n\r\n'
+
+# Headers for tools that POST a JSON body
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Maximum number of requests a batch tool keeps in flight at once
+BATCH_CONCURRENCY = 8
+
+# Successful preview_csv results are reused for this many seconds
+PREVIEW_CACHE_TTL = 30
+PREVIEW_CACHE_MAXSIZE = 256
+
+# Fail fast on unreachable servers; allow slow responses once connected
+HTTP_TIMEOUT = httpx.Timeout(connect=3.0, read=30.0, write=30.0, pool=5.0)
+
+# Keep-alive pool shared by all tools so repeat calls skip the TCP+TLS handshake
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60)
+
+# Shared HTTP client, created lazily on first use and closed on shutdown
+_client: httpx.AsyncClient | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS)
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client if one has been created."""
+    global _client
+    # Detach before awaiting, so a caller arriving mid-close gets a fresh client
+    client, _client = _client, None
+    if client is not None:
+        await client.aclose()
+
+
+# Number of MCP sessions currently inside the lifespan
+_active_sessions = 0
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Close the shared HTTP client when the last active session shuts down.
+
+    stdio runs a single session, but streamable-http enters the lifespan once
+    per session, so the client is only closed once no session can still use it.
+    The client itself is created lazily by the first tool call, on the server's
+    event loop.
+    """
+    global _active_sessions
+    _active_sessions += 1
+    try:
+        yield
+    finally:
+        _active_sessions -= 1
+        if _active_sessions == 0:
+            await close_client()
+
+
+mcp = FastMCP("seqgpt-local-mcp", lifespan=lifespan)
+
+# (server_url, input_file_path, lines) -> (expiry time, result)
+_preview_cache: OrderedDict[tuple[str, str, int], tuple[float, dict]] = OrderedDict()
+
+
+def _cache_get(cache: OrderedDict, key: tuple) -> dict | None:
+    """Return a copy of a cached result, or None if it is missing or expired."""
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    expires_at, result = entry
+    if expires_at < time.monotonic():
+        del cache[key]
+        return None
+    return dict(result)
+
 
+def _cache_put(cache: OrderedDict, key: tuple, result: dict, ttl: float, maxsize: int) -> None:
+    """Store a result, evicting the oldest entries once the cache is full."""
+    cache[key] = (time.monotonic() + ttl, dict(result))
+    cache.move_to_end(key)
+    while len(cache) > maxsize:
+        cache.popitem(last=False)
+
+
+def _json_dumps(data: object) -> bytes:
+    """Serialize data to UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode('utf-8')
+
+
+def _json_loads(data: bytes) -> object:
+    """Parse UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _response_payload(response: httpx.Response) -> object:
+    """Return the parsed body of a JSON response, or the body text otherwise."""
+    if response.headers.get("content-type", "").startswith("application/json"):
+        return _json_loads(response.content)
+    return response.text
+
+
+def _gcs_object(gcs_url: str) -> str:
+    """Return the object path of a gs://bucket/path URL, without the bucket name."""
+    if not gcs_url.startswith("gs://"):
+        raise ValueError("Invalid GCS URL")
+    _, sep, obj = gcs_url.removeprefix("gs://").partition("/")
+    if not sep or not obj:
+        raise ValueError("Invalid GCS URL")
+    return obj
+
+
+def _error_result(error: str, server_url: str, context: dict, status_code: int | None = None) -> dict:
+    """Build a failed tool result, echoing the tool's request context."""
+    result = {"success": False, "error": error}
+    if status_code is not None:
+        result["status_code"] = status_code
+    result["server_url"] = server_url
+    result.update(context)
+    return result
+
+
+async def _post(
+    server_url: str,
+    error_prefix: str,
+    context: dict,
+    timeout: float | None = None,
+    **request_kwargs
+) -> dict:
+    """POST to server_url and wrap the response, or the failure, in a tool result.
+
+    timeout overrides every phase of HTTP_TIMEOUT for this one request.
+    """
+    request_timeout = HTTP_TIMEOUT if timeout is None else httpx.Timeout(timeout)
+    try:
+        response = await get_client().post(server_url, timeout=request_timeout, **request_kwargs)
+        response.raise_for_status()
+        return {
+            "success": True,
+            "status_code": response.status_code,
+            "response": _response_payload(response),
+            "server_url": server_url,
+            **context
+        }
+    except httpx.HTTPStatusError as e:
+        return _error_result(
+            f"HTTP error {e.response.status_code}: {e.response.reason_phrase}",
+            server_url,
+            context,
+            status_code=e.response.status_code
+        )
+    except httpx.ConnectTimeout:
+        return _error_result(f"Connect timeout after {request_timeout.connect}s", server_url, context)
+    except httpx.ReadTimeout:
+        return _error_result(f"Read timeout after {request_timeout.read}s", server_url, context)
+    except httpx.RequestError as e:
+        return _error_result(f"Request error: {str(e) or type(e).__name__}", server_url, context)
+    except Exception as e:
+        return _error_result(f"{error_prefix}: {str(e)}", server_url, context)
+
+
+async def _post_json(
+    server_url: str,
+    data: dict,
+    error_prefix: str,
+    context: dict,
+    timeout: float | None = None
+) -> dict:
+    """POST data as JSON and wrap the response, or the failure, in a tool result."""
+    # Values JSON cannot encode (e.g. ints beyond 64 bits, lone surrogates) are a tool error too
+    try:
+        content = _json_dumps(data)
+    except (TypeError, ValueError) as e:
+        return _error_result(f"{error_prefix}: {str(e)}", server_url, context)
+    return await _post(server_url, error_prefix, context, timeout, content=content, headers=JSON_HEADERS)
+
+
+async def _gather_limited(calls: list[Awaitable[dict]]) -> list[dict]:
+    """Await tool calls concurrently, at most BATCH_CONCURRENCY at a time, keeping their order."""
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run(call: Awaitable[dict]) -> dict:
+        async with semaphore:
+            return await call
+
+    return list(await asyncio.gather(*(run(call) for call in calls)))
+
+
+async def _iter_multipart(file_path: str, preamble: bytes, trailer: bytes) -> AsyncIterator[bytes]:
+    """Yield a multipart body piece by piece so the file is never fully loaded in memory."""
+    yield preamble
+    async with await anyio.open_file(file_path, 'rb') as file:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            yield chunk
+    yield trailer
 
 
 @mcp.tool(title="Upload File", description="Upload a file to the server")
-def upload_file(
+async def upload_file(
     file_path: str,
-    server_url: str | None = None
+    server_url: str | None = None,
+    timeout: float | None = None
 ) -> dict:
     """
     Upload a file to the server.
@@ -57,86 +277,81 @@ def upload_file(
     Args:
         file_path: Path to the file to upload
         server_url: URL of the upload endpoint (defaults to SERVER_BASE_URL/upload)
+        timeout: Per-request timeout in seconds (defaults to HTTP_TIMEOUT)
     
     Returns:
         Dictionary containing the upload response
     """
+    if server_url is None:
+        server_url = f"{SERVER_BASE_URL}/upload"
     try:
-        if server_url is None:
-            server_url = f"{SERVER_BASE_URL}/upload"
-        if not os.path.exists(file_path):
-            return {
-                "success": False,
-                "error": f"File not found: {file_path}"
-            }
-        
-        # Read the file
-        with open(file_path, 'rb') as file:
-            file_data = file.read()
-        
-        # Get filename from path
-        filename = os.path.basename(file_path)
-        
-        # Create multipart form data
-        boundary = '----WebKitFormBoundary' + ''.join([str(random.randint(0, 9)) for _ in range(16)])
-        
-        # Build the multipart body
-        body_parts = []
-        body_parts.append(f'--{boundary}'.encode())
-        body_parts.append(f'Content-Disposition: form-data; name="file"; filename="{filename}"'.encode())
-        body_parts.append(b'Content-Type: application/octet-stream')
-        body_parts.append(b'')
-        body_parts.append(file_data)
-        body_parts.append(f'--{boundary}--'.encode())
-        
-        body = b'\r\n'.join(body_parts)
-        
-        # Create request
-        req = urllib.request.Request(
-            server_url,
-            data=body,
-            method='POST'
-        )
-        req.add_header('Content-Type', f'multipart/form-data; boundary={boundary}')
-        req.add_header('Content-Length', str(len(body)))
-        
-        # Make the request
-        with urllib.request.urlopen(req, timeout=30) as response:
-            response_data = response.read().decode('utf-8')
-            
-        return {
-            "success": True,
-            "status_code": response.status,
-            "response": response_data,
-            "file_path": file_path,
-            "server_url": server_url
-        }
-    except urllib.error.HTTPError as e:
+        file_stat = os.stat(file_path)
+    except FileNotFoundError:
         return {
             "success": False,
-            "error": f"HTTP error {e.code}: {e.reason}",
-            "status_code": e.code,
-            "server_url": server_url
+            "error": f"File not found: {file_path}"
         }
-    except urllib.error.URLError as e:
+    except (OSError, ValueError) as e:
         return {
             "success": False,
-            "error": f"URL error: {str(e.reason)}",
-            "server_url": server_url
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "error": f"Upload failed: {str(e)}",
-            "server_url": server_url
+            "error": f"Upload failed: {str(e)}"
         }
+    
+    # Get filename from path
+    filename = os.path.basename(file_path)
+    
+    # Create multipart form data
+    boundary = '----WebKitFormBoundary' + secrets.token_hex(8)
+    
+    # Build the multipart framing around the streamed file contents
+    preamble = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"'.encode()
+        + MULTIPART_STATIC_HEADERS
+    )
+    trailer = f'\r\n--{boundary}--'.encode()
+    
+    # Small files get an exact Content-Length; large ones are sent chunked so a
+    # file that changes size mid-read cannot desync the declared length
+    headers = {'Content-Type': f'multipart/form-data; boundary={boundary}'}
+    if file_stat.st_size < CHUNKED_UPLOAD_THRESHOLD:
+        headers['Content-Length'] = str(len(preamble) + file_stat.st_size + len(trailer))
+    
+    return await _post(
+        server_url,
+        "Upload failed",
+        {"file_path": file_path},
+        timeout,
+        content=_iter_multipart(file_path, preamble, trailer),
+        headers=headers
+    )
+
+
+@mcp.tool(title="Upload Many Files", description="Upload several files to the server concurrently")
+async def upload_many(
+    file_paths: list[str],
+    server_url: str | None = None,
+    timeout: float | None = None
+) -> list[dict]:
+    """
+    Upload several files to the server concurrently.
+    
+    Args:
+        file_paths: Paths of the files to upload
+        server_url: URL of the upload endpoint (defaults to SERVER_BASE_URL/upload)
+        timeout: Per-request timeout in seconds (defaults to HTTP_TIMEOUT)
+    
+    Returns:
+        List of upload_file results, in the same order as file_paths
+    """
+    return await _gather_limited([upload_file(path, server_url, timeout) for path in file_paths])
 
 
 @mcp.tool(title="Create Random CSV", description="Create a random CSV file using the server endpoint")
-def create_random_csv(
+async def create_random_csv(
     num_rows: int = 10,
     columns: list[str] | None = None,
-    server_url: str | None = None
+    server_url: str | None = None,
+    timeout: float | None = None
 ) -> dict:
     """
     Create a random CSV file using the server endpoint.
@@ -145,68 +360,28 @@ def create_random_csv(
         num_rows: Number of rows to generate (default: 10)
         columns: List of column names. If None, defaults to ["ID", "Value A", "Value B", "Value C"]
         server_url: URL of the create-random-csv endpoint (defaults to SERVER_BASE_URL/create-random-csv)
+        timeout: Per-request timeout in seconds (defaults to HTTP_TIMEOUT)
     
     Returns:
         Dictionary containing the response from the server
     """
-    try:
-        if server_url is None:
-            server_url = f"{SERVER_BASE_URL}/create-random-csv"
-        data = {"rows": num_rows}
-        if columns is not None:
-            data["columns"] = columns
-        
-        # Convert to JSON
-        json_data = json.dumps(data).encode('utf-8')
-        
-        # Create request
-        req = urllib.request.Request(
-            server_url,
-            data=json_data,
-            method='POST'
-        )
-        req.add_header('Content-Type', 'application/json')
-        req.add_header('Content-Length', str(len(json_data)))
-        
-        # Make the request
-        with urllib.request.urlopen(req, timeout=30) as response:
-            response_data = response.read().decode('utf-8')
-            
-        return {
-            "success": True,
-            "status_code": response.status,
-            "response": response_data,
-            "server_url": server_url,
-            "request_data": data
-        }
-    except urllib.error.HTTPError as e:
-        return {
-            "success": False,
-            "error": f"HTTP error {e.code}: {e.reason}",
-            "status_code": e.code,
-            "server_url": server_url
-        }
-    except urllib.error.URLError as e:
-        return {
-            "success": False,
-            "error": f"URL error: {str(e.reason)}",
-            "server_url": server_url
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "error": f"Create random CSV failed: {str(e)}",
-            "server_url": server_url
-        }
+    if server_url is None:
+        server_url = f"{SERVER_BASE_URL}/create-random-csv"
+    data = {"rows": num_rows}
+    if columns is not None:
+        data["columns"] = columns
+    
+    return await _post_json(server_url, data, "Create random CSV failed", {"request_data": data}, timeout)
 
 
 @mcp.tool(title="CSV SQL Query", description="Execute SQL query on CSV data using the server endpoint")
-def csv_sql_query(
+async def csv_sql_query(
     sql_query: str,
     gcs_url: str | None = None,
     csv_data: str | None = None,
     table_name: str | None = None,
-    server_url: str | None = None
+    server_url: str | None = None,
+    timeout: float | None = None
 ) -> dict:
     """
     Execute SQL query on CSV data using the server endpoint.
@@ -217,83 +392,41 @@ def csv_sql_query(
         csv_data: CSV data as string (optional, if not provided server may use default data)
         table_name: Name of the table to use in SQL queries (optional, defaults to 'df')
         server_url: URL of the csv-sql endpoint (defaults to SERVER_BASE_URL/csv-sql)
+        timeout: Per-request timeout in seconds (defaults to HTTP_TIMEOUT)
     
     Returns:
         Dictionary containing the query results
     """
-    try:
-        if server_url is None:
-            server_url = f"{SERVER_BASE_URL}/csv-sql"
-        # Prepare the request data
-        data = {
-            "sql_query": sql_query
-        }
-        
-        if gcs_url:
-            # Extract filename from GCS URL for input_file_path
-            if not gcs_url.startswith("gs://"):
-                raise ValueError("Invalid GCS URL")
-            filename = gcs_url.split("gs://")[-1]
-            _, filename = filename.split("/", 1)  # Remove bucket name
-            data["input_file_path"] = filename
-        elif csv_data:
-            data["csv_data"] = csv_data
-        
-        if table_name:
-            data["table_name"] = table_name
-        
-        # Convert to JSON
-        json_data = json.dumps(data).encode('utf-8')
-        
-        # Create request
-        req = urllib.request.Request(
-            server_url,
-            data=json_data,
-            method='POST'
-        )
-        req.add_header('Content-Type', 'application/json')
-        req.add_header('Content-Length', str(len(json_data)))
-        
-        # Make the request
-        with urllib.request.urlopen(req, timeout=30) as response:
-            response_data = response.read().decode('utf-8')
-            
-        return {
-            "success": True,
-            "status_code": response.status,
-            "response": response_data,
-            "server_url": server_url,
-            "sql_query": sql_query
-        }
-    except urllib.error.HTTPError as e:
-        return {
-            "success": False,
-            "error": f"HTTP error {e.code}: {e.reason}",
-            "status_code": e.code,
-            "server_url": server_url,
-            "sql_query": sql_query
-        }
-    except urllib.error.URLError as e:
-        return {
-            "success": False,
-            "error": f"URL error: {str(e.reason)}",
-            "server_url": server_url,
-            "sql_query": sql_query
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "error": f"CSV SQL query failed: {str(e)}",
-            "server_url": server_url,
-            "sql_query": sql_query
-        }
+    if server_url is None:
+        server_url = f"{SERVER_BASE_URL}/csv-sql"
+    context = {"sql_query": sql_query}
+    
+    # Prepare the request data
+    data = {
+        "sql_query": sql_query
+    }
+    
+    if gcs_url:
+        # Extract filename from GCS URL for input_file_path
+        try:
+            data["input_file_path"] = _gcs_object(gcs_url)
+        except ValueError as e:
+            return _error_result(f"CSV SQL query failed: {str(e)}", server_url, context)
+    elif csv_data:
+        data["csv_data"] = csv_data
+    
+    if table_name:
+        data["table_name"] = table_name
+    
+    return await _post_json(server_url, data, "CSV SQL query failed", context, timeout)
 
 
 @mcp.tool(title="Preview CSV", description="Preview CSV file data using the server endpoint")
-def preview_csv(
+async def preview_csv(
     gcs_url: str,
     lines: int = 10,
-    server_url: str | None = None
+    server_url: str | None = None,
+    timeout: float | None = None
 ) -> dict:
     """
     Preview CSV file data from GCS.
@@ -302,77 +435,66 @@ def preview_csv(
         gcs_url: GCS URL of the CSV file to preview
         lines: Number of lines to preview (max 1000, defaults to 10)
         server_url: URL of the preview-csv endpoint (defaults to SERVER_BASE_URL/preview-csv)
+        timeout: Per-request timeout in seconds (defaults to HTTP_TIMEOUT)
     
     Returns:
         Dictionary containing the CSV preview data
     """
+    if server_url is None:
+        server_url = f"{SERVER_BASE_URL}/preview-csv"
+    context = {"gcs_url": gcs_url, "lines_requested": lines}
     try:
-        if server_url is None:
-            server_url = f"{SERVER_BASE_URL}/preview-csv"
-        if not gcs_url.startswith("gs://"):
-            raise ValueError("Invalid GCS URL")
-        filename = gcs_url.split("gs://")[-1]
-        _, filename = filename.split("/", 1)  # Remove bucket name
-        
-        # Prepare the request data
-        data = {
-            "input_file_path": filename,
-            "lines": min(lines, 1000)  # Cap at 1000 lines as per server limit
-        }
-        
-        # Convert to JSON
-        json_data = json.dumps(data).encode('utf-8')
-        
-        # Create request
-        req = urllib.request.Request(
-            server_url,
-            data=json_data,
-            method='POST'
-        )
-        req.add_header('Content-Type', 'application/json')
-        req.add_header('Content-Length', str(len(json_data)))
-        
-        # Make the request
-        with urllib.request.urlopen(req, timeout=30) as response:
-            response_data = response.read().decode('utf-8')
-            
-        return {
-            "success": True,
-            "status_code": response.status,
-            "response": response_data,
-            "server_url": server_url,
-            "gcs_url": gcs_url,
-            "lines_requested": lines
-        }
-    except urllib.error.HTTPError as e:
-        return {
-            "success": False,
-            "error": f"HTTP error {e.code}: {e.reason}",
-            "status_code": e.code,
-            "server_url": server_url,
-            "gcs_url": gcs_url
-        }
-    except urllib.error.URLError as e:
-        return {
-            "success": False,
-            "error": f"URL error: {str(e.reason)}",
-            "server_url": server_url,
-            "gcs_url": gcs_url
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "error": f"Preview CSV failed: {str(e)}",
-            "server_url": server_url,
-            "gcs_url": gcs_url
-        }
+        filename = _gcs_object(gcs_url)
+    except ValueError as e:
+        return _error_result(f"Preview CSV failed: {str(e)}", server_url, context)
+    
+    # Prepare the request data
+    data = {
+        "input_file_path": filename,
+        "lines": min(lines, 1000)  # Cap at 1000 lines as per server limit
+    }
+    
+    # Reuse a recent preview of the same object
+    cache_key = (server_url, filename, data["lines"])
+    cached = _cache_get(_preview_cache, cache_key)
+    if cached is not None:
+        cached.update(context)
+        return cached
+    
+    result = await _post_json(server_url, data, "Preview CSV failed", context, timeout)
+    if result["success"]:
+        _cache_put(_preview_cache, cache_key, result, PREVIEW_CACHE_TTL, PREVIEW_CACHE_MAXSIZE)
+    return result
+
+
+@mcp.tool(title="Preview Many CSVs", description="Preview several CSV files concurrently using the server endpoint")
+async def preview_many(
+    gcs_urls: list[str],
+    lines: int = 10,
+    server_url: str | None = None,
+    timeout: float | None = None
+) -> list[dict]:
+    """
+    Preview several CSV files from GCS concurrently.
+    
+    Args:
+        gcs_urls: GCS URLs of the CSV files to preview
+        lines: Number of lines to preview per file (max 1000, defaults to 10)
+        server_url: URL of the preview-csv endpoint (defaults to SERVER_BASE_URL/preview-csv)
+        timeout: Per-request timeout in seconds (defaults to HTTP_TIMEOUT)
+    
+    Returns:
+        List of preview_csv results, in the same order as gcs_urls
+    """
+    return await _gather_limited([preview_csv(url, lines, server_url, timeout) for url in gcs_urls])
 
 
 @mcp.tool(title="CSV to VCF", description="Convert CSV file to VCF format using the server endpoint")
-def csv_to_vcf(
+async def csv_to_vcf(
     gcs_url: str,
     output_filename: str | None = None,
-    server_url: str | None = None
+    server_url: str | None = None,
+    timeout: float | None = None
 ) -> dict:
     """
     Convert CSV file to VCF format.
@@ -381,79 +503,31 @@ def csv_to_vcf(
         gcs_url: GCS URL of the CSV file to convert
         output_filename: Name for the output VCF file (optional, auto-generated if not provided)
         server_url: URL of the csv-to-vcf endpoint (defaults to SERVER_BASE_URL/csv-to-vcf)
+        timeout: Per-request timeout in seconds (defaults to HTTP_TIMEOUT)
     
     Returns:
         Dictionary containing the conversion results
     """
+    if server_url is None:
+        server_url = f"{SERVER_BASE_URL}/csv-to-vcf"
+    context = {"gcs_url": gcs_url, "output_filename": output_filename}
     try:
-        if server_url is None:
-            server_url = f"{SERVER_BASE_URL}/csv-to-vcf"
-        if not gcs_url.startswith("gs://"):
-            raise ValueError("Invalid GCS URL")
-        filename = gcs_url.split("gs://")[-1]
-        _, filename = filename.split("/", 1)  # Remove bucket name
-        
-        # Prepare the request data
-        data = {
-            "input_file_path": filename
-        }
-        
-        if output_filename:
-            data["output_filename"] = output_filename
-        
-        # Convert to JSON
-        json_data = json.dumps(data).encode('utf-8')
-        
-        # Create request
-        req = urllib.request.Request(
-            server_url,
-            data=json_data,
-            method='POST'
-        )
-        req.add_header('Content-Type', 'application/json')
-        req.add_header('Content-Length', str(len(json_data)))
-        
-        # Make the request
-        with urllib.request.urlopen(req, timeout=30) as response:
-            response_data = response.read().decode('utf-8')
-            
-        return {
-            "success": True,
-            "status_code": response.status,
-            "response": response_data,
-            "server_url": server_url,
-            "gcs_url": gcs_url,
-            "output_filename": output_filename
-        }
-    except urllib.error.HTTPError as e:
-        return {
-            "success": False,
-            "error": f"HTTP error {e.code}: {e.reason}",
-            "status_code": e.code,
-            "server_url": server_url,
-            "gcs_url": gcs_url
-        }
-    except urllib.error.URLError as e:
-        return {
-            "success": False,
-            "error": f"URL error: {str(e.reason)}",
-            "server_url": server_url,
-            "gcs_url": gcs_url
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "error": f"CSV to VCF conversion failed: {str(e)}",
-            "server_url": server_url,
-            "gcs_url": gcs_url
-        }
+        data = {"input_file_path": _gcs_object(gcs_url)}
+    except ValueError as e:
+        return _error_result(f"CSV to VCF conversion failed: {str(e)}", server_url, context)
+    
+    if output_filename:
+        data["output_filename"] = output_filename
+    
+    return await _post_json(server_url, data, "CSV to VCF conversion failed", context, timeout)
 
 
 @mcp.tool(title="GWAS PLINK Analysis", description="Run GWAS analysis using PLINK on CSV data using the server endpoint")
-def gwas_plink(
+async def gwas_plink(
     gcs_url: str,
     output_filename: str | None = None,
-    server_url: str | None = None
+    server_url: str | None = None,
+    timeout: float | None = None
 ) -> dict:
     """
     Run GWAS analysis using PLINK on CSV data.
@@ -462,72 +536,23 @@ def gwas_plink(
         gcs_url: GCS URL of the CSV file to analyze
         output_filename: Name for the output GWAS results file (optional, auto-generated if not provided)
         server_url: URL of the gwas-plink endpoint (defaults to SERVER_BASE_URL/gwas-plink)
+        timeout: Per-request timeout in seconds (defaults to HTTP_TIMEOUT)
     
     Returns:
         Dictionary containing the GWAS analysis results
     """
+    if server_url is None:
+        server_url = f"{SERVER_BASE_URL}/gwas-plink"
+    context = {"gcs_url": gcs_url, "output_filename": output_filename}
     try:
-        if server_url is None:
-            server_url = f"{SERVER_BASE_URL}/gwas-plink"
-        if not gcs_url.startswith("gs://"):
-            raise ValueError("Invalid GCS URL")
-        filename = gcs_url.split("gs://")[-1]
-        _, filename = filename.split("/", 1)  # Remove bucket name
-        
-        # Prepare the request data
-        data = {
-            "input_file_path": filename
-        }
-        
-        if output_filename:
-            data["output_filename"] = output_filename
-        
-        # Convert to JSON
-        json_data = json.dumps(data).encode('utf-8')
-        
-        # Create request
-        req = urllib.request.Request(
-            server_url,
-            data=json_data,
-            method='POST'
-        )
-        req.add_header('Content-Type', 'application/json')
-        req.add_header('Content-Length', str(len(json_data)))
-        
-        # Make the request
-        with urllib.request.urlopen(req, timeout=30) as response:
-            response_data = response.read().decode('utf-8')
-            
-        return {
-            "success": True,
-            "status_code": response.status,
-            "response": response_data,
-            "server_url": server_url,
-            "gcs_url": gcs_url,
-            "output_filename": output_filename
-        }
-    except urllib.error.HTTPError as e:
-        return {
-            "success": False,
-            "error": f"HTTP error {e.code}: {e.reason}",
-            "status_code": e.code,
-            "server_url": server_url,
-            "gcs_url": gcs_url
-        }
-    except urllib.error.URLError as e:
-        return {
-            "success": False,
-            "error": f"URL error: {str(e.reason)}",
-            "server_url": server_url,
-            "gcs_url": gcs_url
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "error": f"GWAS PLINK analysis failed: {str(e)}",
-            "server_url": server_url,
-            "gcs_url": gcs_url
-        }
+        data = {"input_file_path": _gcs_object(gcs_url)}
+    except ValueError as e:
+        return _error_result(f"GWAS PLINK analysis failed: {str(e)}", server_url, context)
+    
+    if output_filename:
+        data["output_filename"] = output_filename
+    
+    return await _post_json(server_url, data, "GWAS PLINK analysis failed", context, timeout)
 
 
 @mcp.resource("hello://helper", title="Hello resource")
@@ -1,107 +1,190 @@
 #!/usr/bin/env python3
 """
-Test script for the SeqGPT Local MCP Server using unittest
+Test script for the SeqGPT Local MCP Server (unittest test cases, run with pytest-xdist)
 This allows you to test the server functionality locally without reinstalling.
 
 Usage:
-python test_server.py                    # Test against remote server
-python test_server.py --local            # Test against local server
+python test_server.py                    # Test with the HTTP layer mocked
+python test_server.py --run-live         # Also test against remote server
+python test_server.py --local --run-live # Also test against local server
+pytest test_server.py -n auto            # Test with pytest directly
 """
 
 import os
 import sys
 import tempfile
-import json
+import logging
 import unittest
+import unittest.mock
+import contextlib
 import argparse
+import asyncio
 from pathlib import Path
 
+import httpx
+import pytest
+
 # Add the server directory to the path so we can import the main module
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'server'))
 
-from main import upload_file, hello, create_random_csv, csv_sql_query, preview_csv, csv_to_vcf, gwas_plink
+import main as server
+from main import upload_file, upload_many, hello, create_random_csv, csv_sql_query, preview_csv, preview_many, csv_to_vcf, gwas_plink, close_client
+from main import main as _server_main
 
-# Global server URL - defaults to remote, can be overridden with --local flag
-SERVER_BASE_URL = "https://seqgpt-server-for-mcp-761250691807.us-central1.run.app"
+logger = logging.getLogger(__name__)
 
-class TestSeqGPTMCP(unittest.TestCase):
-    """Test cases for the SeqGPT Local MCP Server"""
-    
-    def test_server_startup(self):
-        """Test that the server can start without errors"""
+# Per-request timeout in seconds, so a cold or unreachable server skips a test instead of stalling the suite
+REQUEST_TIMEOUT = 5
+
+# Error prefixes the tools report when a request runs out of time
+TIMEOUT_ERRORS = ("Connect timeout", "Read timeout")
+
+# Canned JSON responses for each server endpoint, served by mock_server
+MOCK_RESPONSES = {
+    "/upload": {"url": "gs://test-bucket/uploads/upload.txt"},
+    "/create-random-csv": {"url": "gs://test-bucket/data/random.csv"},
+    "/preview-csv": {"preview": "ID,Name,Value\n1,a,0.5\n2,b,0.7"},
+    "/csv-sql": {"rows": [{"ID": 1, "Name": "a", "Value": 0.5}]},
+    "/csv-to-vcf": {"url": "gs://test-bucket/data/test_output.vcf"},
+    "/gwas-plink": {"url": "gs://test-bucket/data/test_gwas_results.glm.linear"},
+}
+
+
+def mock_server(server_base_url: str):
+    """Build a handler answering requests to server_base_url with canned JSON; any other host is unreachable."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if not str(request.url).startswith(server_base_url):
+            raise httpx.ConnectError("Connection refused", request=request)
+        payload = MOCK_RESPONSES.get(request.url.path)
+        if payload is None:
+            return httpx.Response(404, request=request)
+        return httpx.Response(200, json=payload, request=request)
+    return handler
+
+
+def concurrency_probe(total: int):
+    """Build a handler answering total requests with 200, recording the peak number in flight.
+
+    Earlier requests are held longer, so they finish out of order.
+    """
+    stats = {"started": 0, "in_flight": 0, "peak": 0}
+    async def handler(request: httpx.Request) -> httpx.Response:
+        stats["started"] += 1
+        stats["in_flight"] += 1
+        stats["peak"] = max(stats["peak"], stats["in_flight"])
         try:
-            from main import main
-            self.assertTrue(True, "Server imports successfully!")
-        except Exception as e:
-            self.fail(f"Server startup test failed with exception: {e}")
+            await asyncio.sleep(0.002 * (total - stats["started"]))
+        finally:
+            stats["in_flight"] -= 1
+        return httpx.Response(200, json={}, request=request)
+    return handler, stats
+
+
+class SeqGPTTestCase(unittest.IsolatedAsyncioTestCase):
+    """Shared setup and helpers for the SeqGPT Local MCP Server test cases"""
     
-    def test_hello_resource(self):
-        """Test the hello resource"""
-        try:
-            result = hello()
-            self.assertIsInstance(result, str)
-            self.assertIn("SeqGPT", result)
-            print(f"Hello resource result: {result}")
-        except Exception as e:
-            self.fail(f"Hello resource test failed with exception: {e}")
+    # Serve requests from mock_server instead of the network
+    mock_http = True
     
-    def test_upload_file_success(self):
-        """Test the upload_file tool with a real server"""
-        print(f"Note: Make sure your server is running on {SERVER_BASE_URL}/upload")
-        
-        # Create a temporary test file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            f.write("This is a test file for upload functionality.\n")
-            f.write("Testing the MCP server upload capability.\n")
-            test_file_path = f.name
-        
-        try:
-            result = upload_file(
-                file_path=test_file_path,
-                server_url=f"{SERVER_BASE_URL}/upload"
+    @pytest.fixture(autouse=True)
+    def _inject_endpoints(self, endpoints):
+        self.endpoints = endpoints
+    
+    async def asyncSetUp(self):
+        # Start every test with an empty preview cache, so each preview reaches the server
+        server._preview_cache.clear()
+        if self.mock_http:
+            server._client = httpx.AsyncClient(transport=httpx.MockTransport(mock_server(self.endpoints.base)))
+    
+    async def serve_with(self, handler):
+        """Answer this test's requests with handler instead of mock_server or the network"""
+        await close_client()
+        server._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    
+    @contextlib.contextmanager
+    def assert_no_network(self):
+        """Fail if the wrapped code asks for the HTTP client"""
+        with unittest.mock.patch.object(server, "get_client") as get_client:
+            yield
+        get_client.assert_not_called()
+    
+    def skip_on_timeout(self, result: dict):
+        """Skip the test if the tool gave up waiting for the server"""
+        if (result.get('error') or '').startswith(TIMEOUT_ERRORS):
+            self.skipTest(f"Server did not answer in time: {result['error']}")
+    
+    def assert_tool_success(self, result: dict):
+        """Fail unless the tool succeeded, skipping instead when the server timed out"""
+        self.skip_on_timeout(result)
+        self.assertTrue(result.get('success'), msg=result.get('error'))
+    
+    async def asyncTearDown(self):
+        # Each test runs on its own event loop, so drop the shared client with it
+        await close_client()
+    
+    async def shared_gcs_url(self) -> str:
+        """Create the CSV file shared by the integration tests on first use, once per class"""
+        cls = type(self)
+        # Look up on this class only, so the mocked and live classes never share a file
+        gcs_url = vars(cls).get("_shared_gcs_url")
+        if gcs_url is None:
+            create_result = await create_random_csv(
+                num_rows=10,
+                columns=["ID", "Name", "Value"],
+                server_url=self.endpoints.create_random_csv,
+                timeout=REQUEST_TIMEOUT
             )
+            self.skip_on_timeout(create_result)
+            if not create_result.get('success'):
+                self.fail(f"Failed to create CSV: {create_result.get('error', 'Unknown error')}")
             
-            self.assertIsInstance(result, dict)
-            self.assertIn("success", result)
-            
-            print(f"Upload result: {json.dumps(result, indent=2)}")
+            # Extract GCS URL from the response
+            gcs_url = create_result["response"].get("url")
+            if not gcs_url:
+                self.fail("No GCS URL returned from create-random-csv endpoint")
             
-            if result.get('success'):
-                print("✅ Upload test passed!")
-            else:
-                print(f"❌ Upload test failed: {result.get('error', 'Unknown error')}")
-                print(f"💡 Make sure your server is running on {SERVER_BASE_URL}/upload")
-                # Don't fail the test if server is not running
-                self.skipTest("Server not available - upload test skipped")
-                
-        except Exception as e:
-            print(f"❌ Upload test failed with exception: {e}")
-            print(f"💡 Make sure your server is running on {SERVER_BASE_URL}/upload")
-            self.skipTest(f"Upload test failed: {e}")
-        finally:
-            # Clean up the test file
-            os.unlink(test_file_path)
+            logger.debug("Created CSV file at: %s", gcs_url)
+            cls._shared_gcs_url = gcs_url
+        return gcs_url
+
+
+class ServerRoundTripTests:
+    """Test cases that exchange requests with the server, so they run both mocked and live"""
     
-    def test_upload_file_nonexistent(self):
-        """Test upload_file with a non-existent file"""
-        result = upload_file(
-            file_path="/nonexistent/file.txt",
-            server_url=f"{SERVER_BASE_URL}/upload"
-        )
+    async def test_upload_file_success(self):
+        """Test the upload_file tool"""
+        logger.debug("Using server endpoint %s", self.endpoints.upload)
+        
+        # Create a test file in a temporary directory that is always removed
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            test_file_path = Path(tmp_dir) / "upload.txt"
+            test_file_path.write_text(
+                "This is a test file for upload functionality.\n"
+                "Testing the MCP server upload capability.\n"
+            )
+            
+            result = await upload_file(
+                file_path=str(test_file_path),
+                server_url=self.endpoints.upload,
+                timeout=REQUEST_TIMEOUT
+            )
         
         self.assertIsInstance(result, dict)
-        self.assertFalse(result.get('success', True))
-        self.assertIn("error", result)
-        self.assertIn("File not found", result["error"])
+        self.assertIn("success", result)
+        
+        logger.debug("Upload result: %r", result)
+        
+        self.assert_tool_success(result)
     
-    def test_create_random_csv(self):
+    async def test_create_random_csv(self):
         """Test the create_random_csv tool"""
-        print(f"Note: Make sure your server is running on {SERVER_BASE_URL}/create-random-csv")
+        logger.debug("Using server endpoint %s", self.endpoints.create_random_csv)
         
-        result = create_random_csv(
+        result = await create_random_csv(
             num_rows=5,
             columns=["ID", "Name", "Value"],
-            server_url=f"{SERVER_BASE_URL}/create-random-csv"
+            server_url=self.endpoints.create_random_csv,
+            timeout=REQUEST_TIMEOUT
         )
         
         self.assertIsInstance(result, dict)
@@ -109,48 +192,23 @@ class TestSeqGPTMCP(unittest.TestCase):
         self.assertIn("server_url", result)
         self.assertIn("request_data", result)
         
-        print(f"Create random CSV result: {json.dumps(result, indent=2)}")
+        logger.debug("Create random CSV result: %r", result)
         
-        if result.get('success'):
-            print("✅ Create random CSV test passed!")
-        else:
-            print(f"❌ Create random CSV test failed: {result.get('error', 'Unknown error')}")
-            print(f"💡 Make sure your server is running on {SERVER_BASE_URL}/create-random-csv")
-            self.fail(f"Create random CSV test failed: {result.get('error', 'Unknown error')}")
+        self.assert_tool_success(result)
     
-    def test_preview_csv(self):
+    async def test_preview_csv(self):
         """Test the preview_csv tool"""
-        print("Note: Make sure your server is running on both endpoints")
-        
-        # Step 1: Create a CSV file first
-        print("Step 1: Creating CSV file...")
-        create_result = create_random_csv(
-            num_rows=8,
-            columns=["ID", "Name", "Value"],
-            server_url=f"{SERVER_BASE_URL}/create-random-csv"
-        )
-        
-        self.assertIsInstance(create_result, dict)
-        self.assertIn("success", create_result)
-        
-        if not create_result.get('success'):
-            self.fail(f"Failed to create CSV: {create_result.get('error', 'Unknown error')}")
-        
-        # Extract GCS URL from the response
-        response_data = json.loads(create_result["response"])
-        gcs_url = response_data.get("url")
+        logger.debug("Using server %s", self.endpoints.base)
         
-        if not gcs_url:
-            self.fail("No GCS URL returned from create-random-csv endpoint")
+        gcs_url = await self.shared_gcs_url()
         
-        print(f"Created CSV file at: {gcs_url}")
-        
-        # Step 2: Preview the CSV file
-        print("Step 2: Previewing CSV file...")
-        result = preview_csv(
+        # Preview the shared CSV file
+        logger.debug("Previewing CSV file %s", gcs_url)
+        result = await preview_csv(
             gcs_url=gcs_url,
             lines=5,
-            server_url=f"{SERVER_BASE_URL}/preview-csv"
+            server_url=self.endpoints.preview_csv,
+            timeout=REQUEST_TIMEOUT
         )
         
         self.assertIsInstance(result, dict)
@@ -159,61 +217,31 @@ class TestSeqGPTMCP(unittest.TestCase):
         self.assertIn("gcs_url", result)
         self.assertIn("lines_requested", result)
         
-        print(f"Preview CSV result: {json.dumps(result, indent=2)}")
+        logger.debug("Preview CSV result: %r", result)
         
-        if result.get('success'):
-            print("✅ Preview CSV test passed!")
-        else:
-            print(f"❌ Preview CSV test failed: {result.get('error', 'Unknown error')}")
-            print("💡 Make sure your server is running on both endpoints")
-            self.fail(f"Preview CSV test failed: {result.get('error', 'Unknown error')}")
+        self.assert_tool_success(result)
     
-    def test_preview_csv_invalid_url(self):
-        """Test preview_csv with invalid GCS URL"""
-        result = preview_csv(
-            gcs_url="invalid-url",
-            lines=5,
-            server_url=f"{SERVER_BASE_URL}/preview-csv"
-        )
-        
-        self.assertIsInstance(result, dict)
-        self.assertFalse(result.get('success', True))
-        self.assertIn("error", result)
-        self.assertIn("Invalid GCS URL", result["error"])
-    
-    def test_create_csv_and_preview(self):
-        """Test the integration: create CSV file and then preview it"""
-        print("Note: Make sure your server is running on both endpoints")
-        
-        # Step 1: Create a CSV file
-        print("Step 1: Creating CSV file...")
-        create_result = create_random_csv(
-            num_rows=10,
-            columns=["ID", "Name", "Value"],
-            server_url=f"{SERVER_BASE_URL}/create-random-csv"
-        )
-        
-        self.assertIsInstance(create_result, dict)
-        self.assertIn("success", create_result)
-        
-        if not create_result.get('success'):
-            self.fail(f"Failed to create CSV: {create_result.get('error', 'Unknown error')}")
-        
-        # Extract GCS URL from the response
-        response_data = json.loads(create_result["response"])
-        gcs_url = response_data.get("url")
-        
-        if not gcs_url:
-            self.fail("No GCS URL returned from create-random-csv endpoint")
-        
-        print(f"Created CSV file at: {gcs_url}")
-        
-        # Step 2: Preview the CSV file
-        print("Step 2: Previewing CSV file...")
-        preview_result = preview_csv(
-            gcs_url=gcs_url,
-            lines=5,
-            server_url=f"{SERVER_BASE_URL}/preview-csv"
+    async def test_create_csv_then_preview_and_query(self):
+        """Test the integration: create CSV file, then preview it and query it with SQL concurrently"""
+        logger.debug("Using server %s", self.endpoints.base)
+        
+        gcs_url = await self.shared_gcs_url()
+        
+        # Preview and query the shared CSV file at the same time
+        logger.debug("Previewing and querying CSV file %s", gcs_url)
+        preview_result, query_result = await asyncio.gather(
+            preview_csv(
+                gcs_url=gcs_url,
+                lines=5,
+                server_url=self.endpoints.preview_csv,
+                timeout=REQUEST_TIMEOUT
+            ),
+            csv_sql_query(
+                sql_query="SELECT * FROM df LIMIT 3",
+                gcs_url=gcs_url,
+                server_url=self.endpoints.csv_sql,
+                timeout=REQUEST_TIMEOUT
+            )
         )
         
         self.assertIsInstance(preview_result, dict)
@@ -221,75 +249,29 @@ class TestSeqGPTMCP(unittest.TestCase):
         self.assertIn("server_url", preview_result)
         self.assertIn("gcs_url", preview_result)
         
-        print(f"CSV preview result: {json.dumps(preview_result, indent=2)}")
-        
-        if preview_result.get('success'):
-            print("✅ Create CSV and preview integration test passed!")
-        else:
-            print(f"❌ Create CSV and preview integration test failed: {preview_result.get('error', 'Unknown error')}")
-            print("💡 Make sure your server is running on both endpoints")
-            self.fail(f"Create CSV and preview integration test failed: {preview_result.get('error', 'Unknown error')}")
-    
-    def test_create_csv_and_query(self):
-        """Test the integration: create CSV file and then query it with SQL"""
-        print("Note: Make sure your server is running on both endpoints")
-        
-        # Step 1: Create a CSV file
-        print("Step 1: Creating CSV file...")
-        create_result = create_random_csv(
-            num_rows=5,
-            columns=["ID", "Name", "Value"],
-            server_url=f"{SERVER_BASE_URL}/create-random-csv"
-        )
-        
-        self.assertIsInstance(create_result, dict)
-        self.assertIn("success", create_result)
-        
-        if not create_result.get('success'):
-            self.fail(f"Failed to create CSV: {create_result.get('error', 'Unknown error')}")
-        
-        # Extract GCS URL from the response
-        response_data = json.loads(create_result["response"])
-        gcs_url = response_data.get("url")
-        
-        if not gcs_url:
-            self.fail("No GCS URL returned from create-random-csv endpoint")
-        
-        print(f"Created CSV file at: {gcs_url}")
-        
-        # Step 2: Query the CSV file with SQL
-        print("Step 2: Querying CSV file with SQL...")
-        query_result = csv_sql_query(
-            sql_query="SELECT * FROM df LIMIT 3",
-            gcs_url=gcs_url,
-            server_url=f"{SERVER_BASE_URL}/csv-sql"
-        )
-        
         self.assertIsInstance(query_result, dict)
         self.assertIn("success", query_result)
         self.assertIn("server_url", query_result)
         self.assertIn("sql_query", query_result)
         
-        print(f"CSV SQL query result: {json.dumps(query_result, indent=2)}")
+        logger.debug("CSV preview result: %r", preview_result)
+        logger.debug("CSV SQL query result: %r", query_result)
         
-        if query_result.get('success'):
-            print("✅ Create CSV and query integration test passed!")
-        else:
-            print(f"❌ Create CSV and query integration test failed: {query_result.get('error', 'Unknown error')}")
-            print("💡 Make sure your server is running on both endpoints")
-            self.fail(f"Create CSV and query integration test failed: {query_result.get('error', 'Unknown error')}")
+        self.assert_tool_success(preview_result)
+        self.assert_tool_success(query_result)
     
-    def test_csv_to_vcf(self):
+    async def test_csv_to_vcf(self):
         """Test the csv_to_vcf tool"""
-        print(f"Note: Make sure your server is running on {SERVER_BASE_URL}/csv-to-vcf")
+        logger.debug("Using server endpoint %s", self.endpoints.csv_to_vcf)
         
         # Test with a sample GCS URL
         test_gcs_url = "gs://test-bucket/data/sample.csv"
         
-        result = csv_to_vcf(
+        result = await csv_to_vcf(
             gcs_url=test_gcs_url,
             output_filename="test_output.vcf",
-            server_url=f"{SERVER_BASE_URL}/csv-to-vcf"
+            server_url=self.endpoints.csv_to_vcf,
+            timeout=REQUEST_TIMEOUT
         )
         
         self.assertIsInstance(result, dict)
@@ -298,26 +280,22 @@ class TestSeqGPTMCP(unittest.TestCase):
         self.assertIn("gcs_url", result)
         self.assertIn("output_filename", result)
         
-        print(f"CSV to VCF result: {json.dumps(result, indent=2)}")
+        logger.debug("CSV to VCF result: %r", result)
         
-        if result.get('success'):
-            print("✅ CSV to VCF test passed!")
-        else:
-            print(f"❌ CSV to VCF test failed: {result.get('error', 'Unknown error')}")
-            print(f"💡 Make sure your server is running on {SERVER_BASE_URL}/csv-to-vcf")
-            self.fail(f"CSV to VCF test failed: {result.get('error', 'Unknown error')}")
+        self.assert_tool_success(result)
     
-    def test_gwas_plink(self):
+    async def test_gwas_plink(self):
         """Test the gwas_plink tool"""
-        print(f"Note: Make sure your server is running on {SERVER_BASE_URL}/gwas-plink")
+        logger.debug("Using server endpoint %s", self.endpoints.gwas_plink)
         
         # Test with a sample GCS URL
         test_gcs_url = "gs://test-bucket/data/sample.csv"
         
-        result = gwas_plink(
+        result = await gwas_plink(
             gcs_url=test_gcs_url,
             output_filename="test_gwas_results.glm.linear",
-            server_url=f"{SERVER_BASE_URL}/gwas-plink"
+            server_url=self.endpoints.gwas_plink,
+            timeout=REQUEST_TIMEOUT
         )
         
         self.assertIsInstance(result, dict)
@@ -326,78 +304,341 @@ class TestSeqGPTMCP(unittest.TestCase):
         self.assertIn("gcs_url", result)
         self.assertIn("output_filename", result)
         
-        print(f"GWAS PLINK result: {json.dumps(result, indent=2)}")
+        logger.debug("GWAS PLINK result: %r", result)
         
-        if result.get('success'):
-            print("✅ GWAS PLINK test passed!")
-        else:
-            print(f"❌ GWAS PLINK test failed: {result.get('error', 'Unknown error')}")
-            print(f"💡 Make sure your server is running on {SERVER_BASE_URL}/gwas-plink")
-            self.fail(f"GWAS PLINK test failed: {result.get('error', 'Unknown error')}")
+        self.assert_tool_success(result)
+
+
+class TestSeqGPTMCP(ServerRoundTripTests, SeqGPTTestCase):
+    """Test cases for the SeqGPT Local MCP Server, with the HTTP layer mocked"""
     
-    def test_csv_to_vcf_invalid_url(self):
-        """Test csv_to_vcf with invalid GCS URL"""
-        result = csv_to_vcf(
-            gcs_url="invalid-url",
-            output_filename="test.vcf",
-            server_url=f"{SERVER_BASE_URL}/csv-to-vcf"
+    def test_server_startup(self):
+        """Test that the server entry point imports without errors"""
+        self.assertTrue(callable(_server_main))
+    
+    def test_hello_resource(self):
+        """Test the hello resource"""
+        try:
+            result = hello()
+            self.assertIsInstance(result, str)
+            self.assertIn("SeqGPT", result)
+            logger.debug("Hello resource result: %r", result)
+        except Exception as e:
+            self.fail(f"Hello resource test failed with exception: {e}")
+    
+    async def test_close_client_detaches_first(self):
+        """Test that a client requested while the shared one is closing is a fresh one"""
+        closing = server.get_client()
+        requested_mid_close = []
+        original_aclose = closing.aclose
+        async def aclose():
+            requested_mid_close.append(server.get_client())
+            await original_aclose()
+        closing.aclose = aclose
+        
+        await close_client()
+        
+        self.assertIsNot(requested_mid_close[0], closing)
+        self.assertFalse(requested_mid_close[0].is_closed)
+    
+    async def capture_upload(self, file_path: str) -> httpx.Request:
+        """Upload file_path through a handler that records it, returning the request as sent"""
+        requests = []
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={}, request=request)
+        await self.serve_with(handler)
+        
+        result = await upload_file(file_path=file_path, server_url=self.endpoints.upload)
+        
+        self.assert_tool_success(result)
+        self.assertEqual(len(requests), 1)
+        return requests[0]
+    
+    def assert_multipart_body(self, request: httpx.Request, filename: str, contents: bytes):
+        """Check that request carries exactly one multipart file part holding contents"""
+        content_type, _, boundary = request.headers["Content-Type"].partition("; boundary=")
+        self.assertEqual(content_type, "multipart/form-data")
+        self.assertEqual(
+            request.content,
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'.encode()
+            + b'Content-Type: application/octet-stream\r\n\r\n'
+            + contents
+            + f'\r\n--{boundary}--'.encode()
+        )
+    
+    async def test_upload_file_wire_format(self):
+        """Test that a small upload declares the exact Content-Length of its multipart body"""
+        contents = b"ID,Name\n1,a\n"
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            test_file_path = Path(tmp_dir) / "upload.csv"
+            test_file_path.write_bytes(contents)
+            request = await self.capture_upload(str(test_file_path))
+        
+        self.assert_multipart_body(request, "upload.csv", contents)
+        self.assertEqual(request.headers["Content-Length"], str(len(request.content)))
+        self.assertNotIn("Transfer-Encoding", request.headers)
+    
+    async def test_upload_file_chunked(self):
+        """Test that an upload at or above CHUNKED_UPLOAD_THRESHOLD is sent chunked"""
+        contents = b"ID,Name\n1,a\n"
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            test_file_path = Path(tmp_dir) / "upload.csv"
+            test_file_path.write_bytes(contents)
+            with unittest.mock.patch.object(server, "CHUNKED_UPLOAD_THRESHOLD", 1):
+                request = await self.capture_upload(str(test_file_path))
+        
+        self.assert_multipart_body(request, "upload.csv", contents)
+        self.assertEqual(request.headers["Transfer-Encoding"], "chunked")
+        self.assertNotIn("Content-Length", request.headers)
+    
+    async def test_upload_file_nonexistent(self):
+        """Test upload_file with a non-existent file"""
+        with self.assert_no_network():
+            result = await upload_file(
+                file_path="/nonexistent/file.txt"
+            )
+        
+        self.assertIsInstance(result, dict)
+        self.assertFalse(result.get('success', True))
+        self.assertIn("error", result)
+        self.assertIn("File not found", result["error"])
+    
+    async def test_upload_file_unreadable_path(self):
+        """Test upload_file with a path that cannot be opened as a file"""
+        with tempfile.NamedTemporaryFile() as regular_file:
+            with self.assert_no_network():
+                result = await upload_file(
+                    file_path=os.path.join(regular_file.name, "upload.txt")
+                )
+    
+        self.assertIsInstance(result, dict)
+        self.assertFalse(result.get('success', True))
+        self.assertIn("Upload failed", result["error"])
+    
+    async def test_upload_many_nonexistent(self):
+        """Test upload_many with non-existent files"""
+        with self.assert_no_network():
+            results = await upload_many(
+                file_paths=["/nonexistent/a.txt", "/nonexistent/b.txt"]
+            )
+        
+        self.assertEqual(len(results), 2)
+        self.assertIn("/nonexistent/a.txt", results[0]["error"])
+        self.assertIn("/nonexistent/b.txt", results[1]["error"])
+    
+    async def test_upload_many_concurrency(self):
+        """Test that upload_many keeps results in order with at most BATCH_CONCURRENCY uploads in flight"""
+        total = 2 * server.BATCH_CONCURRENCY + 1
+        handler, stats = concurrency_probe(total)
+        await self.serve_with(handler)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_paths = []
+            for i in range(total):
+                file_path = Path(tmp_dir) / f"upload_{i}.txt"
+                file_path.write_text(f"file {i}\n")
+                file_paths.append(str(file_path))
+            
+            results = await upload_many(file_paths=file_paths, server_url=self.endpoints.upload)
+        
+        self.assertEqual([result["file_path"] for result in results], file_paths)
+        self.assertTrue(all(result["success"] for result in results))
+        self.assertEqual(stats["peak"], server.BATCH_CONCURRENCY)
+    
+    async def test_create_random_csv_unreachable(self):
+        """Test that an unreachable server yields a request error instead of hanging"""
+        # Port 9 is not the test server, so the mock refuses the connection
+        result = await create_random_csv(
+            num_rows=5,
+            server_url="http://127.0.0.1:9/create-random-csv"
         )
         
+        self.assertIsInstance(result, dict)
+        self.assertFalse(result.get('success', True))
+        self.assertIn("error", result)
+        self.assertEqual(result["request_data"], {"rows": 5})
+    
+    async def test_create_random_csv_timeouts(self):
+        """Test that connect and read timeouts are reported with the timeout that applied"""
+        timeouts = [
+            (httpx.ConnectTimeout, "Connect timeout", server.HTTP_TIMEOUT.connect),
+            (httpx.ReadTimeout, "Read timeout", server.HTTP_TIMEOUT.read),
+        ]
+        for exc_type, label, default_timeout in timeouts:
+            def handler(request: httpx.Request, exc_type=exc_type) -> httpx.Response:
+                raise exc_type("timed out", request=request)
+            await self.serve_with(handler)
+            
+            with self.subTest(label, timeout=None):
+                result = await create_random_csv(num_rows=5, server_url=self.endpoints.create_random_csv)
+                self.assertFalse(result["success"])
+                self.assertEqual(result["error"], f"{label} after {default_timeout}s")
+            
+            with self.subTest(label, timeout=REQUEST_TIMEOUT):
+                result = await create_random_csv(
+                    num_rows=5,
+                    server_url=self.endpoints.create_random_csv,
+                    timeout=REQUEST_TIMEOUT
+                )
+                self.assertFalse(result["success"])
+                self.assertEqual(result["error"], f"{label} after {REQUEST_TIMEOUT}s")
+    
+    async def test_preview_csv_invalid_url(self):
+        """Test preview_csv with invalid GCS URL"""
+        with self.assert_no_network():
+            result = await preview_csv(
+                gcs_url="invalid-url",
+                lines=5
+            )
+        
         self.assertIsInstance(result, dict)
         self.assertFalse(result.get('success', True))
         self.assertIn("error", result)
         self.assertIn("Invalid GCS URL", result["error"])
     
-    def test_gwas_plink_invalid_url(self):
+    async def test_preview_csv_missing_object(self):
+        """Test preview_csv with a GCS URL that names only a bucket"""
+        with self.assert_no_network():
+            result = await preview_csv(
+                gcs_url="gs://test-bucket",
+                lines=5
+            )
+        
+        self.assertIsInstance(result, dict)
+        self.assertFalse(result.get('success', True))
+        self.assertIn("Invalid GCS URL", result["error"])
+    
+    async def test_preview_csv_cached(self):
+        """Test that a repeated preview_csv call is served from the cache"""
+        # Nothing listens on this port, so only a cache hit can succeed
+        server_url = "http://127.0.0.1:9/preview-csv"
+        cached_result = {
+            "success": True,
+            "status_code": 200,
+            "response": "ID,Name,Value",
+            "server_url": server_url
+        }
+        server._cache_put(server._preview_cache, (server_url, "data/cached.csv", 5), cached_result,
+                          server.PREVIEW_CACHE_TTL, server.PREVIEW_CACHE_MAXSIZE)
+        
+        with self.assert_no_network():
+            result = await preview_csv(
+                gcs_url="gs://test-bucket/data/cached.csv",
+                lines=5,
+                server_url=server_url
+            )
+        
+        self.assertTrue(result["success"])
+        self.assertEqual(result["response"], "ID,Name,Value")
+        self.assertEqual(result["gcs_url"], "gs://test-bucket/data/cached.csv")
+        self.assertEqual(result["lines_requested"], 5)
+    
+    async def test_preview_many_invalid_urls(self):
+        """Test that preview_many returns one result per URL, in order"""
+        with self.assert_no_network():
+            results = await preview_many(
+                gcs_urls=["invalid-url", "gs://test-bucket", "also-invalid"],
+                lines=5
+            )
+        
+        self.assertEqual(len(results), 3)
+        for gcs_url, result in zip(["invalid-url", "gs://test-bucket", "also-invalid"], results):
+            self.assertFalse(result.get('success', True))
+            self.assertEqual(result["gcs_url"], gcs_url)
+            self.assertIn("Invalid GCS URL", result["error"])
+    
+    async def test_preview_many_concurrency(self):
+        """Test that preview_many keeps results in order with at most BATCH_CONCURRENCY previews in flight"""
+        total = 2 * server.BATCH_CONCURRENCY + 1
+        handler, stats = concurrency_probe(total)
+        await self.serve_with(handler)
+        
+        gcs_urls = [f"gs://test-bucket/data/batch_{i}.csv" for i in range(total)]
+        results = await preview_many(gcs_urls=gcs_urls, lines=5, server_url=self.endpoints.preview_csv)
+        
+        self.assertEqual([result["gcs_url"] for result in results], gcs_urls)
+        self.assertTrue(all(result["success"] for result in results))
+        self.assertEqual(stats["peak"], server.BATCH_CONCURRENCY)
+    
+    async def test_csv_to_vcf_invalid_url(self):
+        """Test csv_to_vcf with invalid GCS URL"""
+        with self.assert_no_network():
+            result = await csv_to_vcf(
+                gcs_url="invalid-url",
+                output_filename="test.vcf"
+            )
+        
+        self.assertIsInstance(result, dict)
+        self.assertFalse(result.get('success', True))
+        self.assertIn("error", result)
+        self.assertIn("Invalid GCS URL", result["error"])
+    
+    async def test_gwas_plink_invalid_url(self):
         """Test gwas_plink with invalid GCS URL"""
-        result = gwas_plink(
-            gcs_url="invalid-url",
-            output_filename="test.glm.linear",
-            server_url=f"{SERVER_BASE_URL}/gwas-plink"
-        )
+        with self.assert_no_network():
+            result = await gwas_plink(
+                gcs_url="invalid-url",
+                output_filename="test.glm.linear"
+            )
         
         self.assertIsInstance(result, dict)
         self.assertFalse(result.get('success', True))
         self.assertIn("error", result)
         self.assertIn("Invalid GCS URL", result["error"])
+    
+    @unittest.skipIf(server.orjson is None, "the stdlib json module encodes these values")
+    async def test_unencodable_values(self):
+        """Test that values JSON cannot encode come back as tool errors instead of raising"""
+        lone_surrogate = "\ud800"
+        calls = [
+            ("Create random CSV failed", lambda: create_random_csv(num_rows=2**70)),
+            ("Create random CSV failed", lambda: create_random_csv(columns=[lone_surrogate])),
+            ("CSV SQL query failed", lambda: csv_sql_query(sql_query=f"select '{lone_surrogate}'")),
+            ("Preview CSV failed", lambda: preview_csv(gcs_url="gs://test-bucket/data.csv", lines=-2**70)),
+            ("Preview CSV failed", lambda: preview_csv(gcs_url=f"gs://test-bucket/{lone_surrogate}.csv")),
+            ("CSV to VCF conversion failed", lambda: csv_to_vcf(gcs_url=f"gs://test-bucket/{lone_surrogate}.csv")),
+            ("CSV to VCF conversion failed", lambda: csv_to_vcf(
+                gcs_url="gs://test-bucket/data.csv", output_filename=f"{lone_surrogate}.vcf")),
+            ("GWAS PLINK analysis failed", lambda: gwas_plink(gcs_url=f"gs://test-bucket/{lone_surrogate}.csv")),
+            ("GWAS PLINK analysis failed", lambda: gwas_plink(
+                gcs_url="gs://test-bucket/data.csv", output_filename=f"{lone_surrogate}.glm.linear")),
+            ("Upload failed", lambda: upload_file(file_path=f"{lone_surrogate}.txt")),
+        ]
+        for error_prefix, call in calls:
+            with self.subTest(error_prefix), self.assert_no_network():
+                result = await call()
+                self.assertFalse(result["success"])
+                self.assertTrue(result["error"].startswith(f"{error_prefix}: "), msg=result["error"])
+
+
+@pytest.mark.live
+class TestSeqGPTMCPLive(ServerRoundTripTests, SeqGPTTestCase):
+    """The round-trip test cases against the real server (enable with --run-live)"""
+    
+    mock_http = False
+
 
 def main():
     """Run all tests"""
     parser = argparse.ArgumentParser(description="Test SeqGPT Local MCP Server")
     parser.add_argument("--local", action="store_true", 
                        help="Test against local server URLs (localhost:8000) instead of remote server")
-    args = parser.parse_args()
+    parser.add_argument("-n", "--workers", type=int, default=max(1, (os.cpu_count() or 1) - 2),
+                       help="Number of pytest-xdist worker processes (defaults to CPU count minus 2)")
+    args, pytest_args = parser.parse_known_args()
     
-    # Set server URL based on --local flag
-    global SERVER_BASE_URL
+    # The --local flag is handled by the server_base_url fixture in conftest.py
     if args.local:
-        SERVER_BASE_URL = "http://localhost:8000"
-        print("🧪 Testing SeqGPT Local MCP Server with unittest (LOCAL MODE)")
+        pytest_args.append("--local")
+        print("🧪 Testing SeqGPT Local MCP Server with pytest (LOCAL MODE)")
     else:
-        print("🧪 Testing SeqGPT Local MCP Server with unittest (REMOTE MODE)")
-    
-    print(f"Server URL: {SERVER_BASE_URL}")
+        print("🧪 Testing SeqGPT Local MCP Server with pytest (REMOTE MODE)")
     print("=" * 60)
     
-    # Create test suite
-    loader = unittest.TestLoader()
-    suite = loader.loadTestsFromTestCase(TestSeqGPTMCP)
-    
-    # Run tests with verbose output
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
-    
-    print("\n" + "=" * 60)
-    if result.wasSuccessful():
-        print("🏁 All tests passed!")
-    else:
-        print(f"❌ {len(result.failures)} test(s) failed, {len(result.errors)} error(s)")
-        for failure in result.failures:
-            print(f"FAIL: {failure[0]}")
-            print(f"     {failure[1]}")
-        for error in result.errors:
-            print(f"ERROR: {error[0]}")
-            print(f"      {error[1]}")
+    # Tests are network-bound, so run them concurrently across worker processes
+    # Remaining arguments (e.g. --run-live) are passed through to pytest
+    sys.exit(pytest.main([__file__, "-v", "-n", str(args.workers), *pytest_args]))
 
 if __name__ == "__main__":
     main()